@@ -18,7 +18,13 @@ Usage:
 """
 
 import json
+import mmap
+import os
 import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heapreplace, nlargest
 from pathlib import Path
 
 try:
@@ -27,83 +33,153 @@ except ImportError:
     print("Install zstandard: pip install zstandard")
     sys.exit(1)
 
+try:
+    # orjson parses straight from bytes and is several times faster per line
+    import orjson
+    from orjson import loads as json_loads
 
-def process_arctic_shift_file(input_path: Path, output_path: Path, top_n: int = 100_000):
-    """Process Arctic Shift subreddits file and extract top N by subscribers."""
+    def json_dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    from json import loads as json_loads
+
+    def json_dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# Large reads/writes keep zstd from re-chunking its output into many small blocks
+READ_SIZE = 8 * 1024 * 1024
+
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+
+def _shard_bounds(path: Path, shards: int) -> list[tuple[int, int]]:
+    """Split a file into roughly equal byte ranges that start and end on line boundaries."""
+    size = path.stat().st_size
+    if size == 0:
+        return []
+
+    bounds = [0]
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for k in range(1, shards):
+            newline = mm.find(b'\n', max(size * k // shards, bounds[-1]))
+            if newline == -1:
+                break
+            bounds.append(newline + 1)
+    bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _parse_shard(path: Path, start: int, end: int, top_n: int) -> tuple[int, int, list[str], list[int]]:
+    """Parse one byte range of the decompressed NDJSON file.
+
+    Returns (records parsed, records with subscribers, names, counts), where
+    names/counts are the shard's local top N in descending subscriber order.
+    """
+    # Bounded min-heap of (subscribers, -arrival, name): memory stays at top_n
+    # entries however large the shard is, and on equal counts the earlier
+    # record wins, matching nlargest over the whole file
+    top: list[tuple[int, int, str]] = []
+    total = 0
+    with_subscribers = 0
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+            page_start = start - start % mmap.PAGESIZE
+            mm.madvise(mmap.MADV_WILLNEED, page_start, end - page_start)
+
+        mm.seek(start)
+        while mm.tell() < end:
+            line = mm.readline()
+            # Only JSON objects are expected; skipping blank or truncated lines
+            # here is cheaper than raising and catching a decode error
+            if not line.startswith(b'{') or not line.endswith((b'}\n', b'}')):
+                continue
+            try:
+                data = json_loads(line)
+                name = data.get('display_name') or data.get('name')
+                subscribers = data.get('subscribers', 0) or 0
+
+                if name and subscribers > 0:
+                    with_subscribers += 1
+                    if len(top) < top_n:
+                        heappush(top, (subscribers, -with_subscribers, name))
+                    elif subscribers > top[0][0]:
+                        heapreplace(top, (subscribers, -with_subscribers, name))
+
+                total += 1
+
+            except json.JSONDecodeError:
+                continue
+
+    top.sort(reverse=True)
+    return total, with_subscribers, [name for _, _, name in top], [subscribers for subscribers, _, _ in top]
+
+
+def process_arctic_shift_file(input_path: Path, output_path: Path, top_n: int = 100_000, workers: int | None = None):
+    """Process Arctic Shift subreddits file and extract top N by subscribers.
+
+    The archive is decompressed to a temporary file next to it, split into
+    line-aligned shards and parsed in a process pool. Each worker keeps only
+    its local top N, and those are merged here.
+    """
+    workers = workers or os.cpu_count() or 1
 
     print(f"Reading {input_path}...")
 
-    subreddits = []
-
-    # Decompress and read NDJSON
-    with open(input_path, 'rb') as f:
-        dctx = zstd.ZstdDecompressor()
-        with dctx.stream_reader(f) as reader:
-            # Read in chunks and process lines
-            buffer = b''
-            total = 0
-
-            while True:
-                chunk = reader.read(1024 * 1024)  # 1MB chunks
-                if not chunk:
-                    break
-
-                buffer += chunk
-                lines = buffer.split(b'\n')
-                buffer = lines[-1]  # Keep incomplete line
-
-                for line in lines[:-1]:
-                    if not line.strip():
-                        continue
-                    try:
-                        data = json.loads(line)
-                        name = data.get('display_name') or data.get('name')
-                        subscribers = data.get('subscribers', 0) or 0
-
-                        if name and subscribers > 0:
-                            subreddits.append((name, subscribers))
-
-                        total += 1
-                        if total % 100_000 == 0:
-                            print(f"  Processed {total:,} subreddits...")
-
-                    except json.JSONDecodeError:
-                        continue
-
-            # Process final buffer
-            if buffer.strip():
-                try:
-                    data = json.loads(buffer)
-                    name = data.get('display_name') or data.get('name')
-                    subscribers = data.get('subscribers', 0) or 0
-                    if name and subscribers > 0:
-                        subreddits.append((name, subscribers))
-                except json.JSONDecodeError:
-                    pass
-
-    print(f"  Total subreddits with subscribers: {len(subreddits):,}")
-
-    # Sort by subscriber count descending
-    print("Sorting by subscriber count...")
-    subreddits.sort(key=lambda x: x[1], reverse=True)
-
-    # Take top N
-    top_subreddits = [name for name, _ in subreddits[:top_n]]
+    # Decompress on the disk that holds the archive - the system temp dir is
+    # often too small for the multi-GB dump
+    with tempfile.TemporaryDirectory(dir=input_path.parent) as tmp_dir:
+        ndjson_path = Path(tmp_dir) / "subreddits.ndjson"
+
+        print("  Decompressing...")
+        with open(input_path, 'rb') as f, open(ndjson_path, 'wb') as out:
+            dctx = zstd.ZstdDecompressor()
+            dctx.copy_stream(f, out, read_size=READ_SIZE, write_size=READ_SIZE)
+
+        shards = _shard_bounds(ndjson_path, workers)
+        print(f"  Parsing {ndjson_path.stat().st_size / 1024 / 1024:,.0f} MB in {len(shards)} shards...")
+
+        total = 0
+        with_subscribers = 0
+        # Shards are merged in file order so ties resolve exactly as a single pass would
+        names: list[str] = []
+        subscriber_counts = array('q')
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_shard, ndjson_path, start, end, top_n) for start, end in shards]
+            for future in futures:
+                shard_total, shard_with_subscribers, shard_names, shard_counts = future.result()
+                total += shard_total
+                with_subscribers += shard_with_subscribers
+                names.extend(shard_names)
+                subscriber_counts.extend(shard_counts)
+                print(f"  Processed {total:,} subreddits...")
+
+    print(f"  Total subreddits with subscribers: {with_subscribers:,}")
+
+    # Select top N by subscriber count without sorting the full list
+    print("Selecting top subreddits by subscriber count...")
+    top = nlargest(top_n, range(len(names)), key=subscriber_counts.__getitem__)
+    top_subreddits = [names[i] for i in top]
 
     print(f"Top {len(top_subreddits):,} subreddits:")
-    print(f"  #1: {top_subreddits[0]} ({subreddits[0][1]:,} subscribers)")
-    print(f"  #10: {top_subreddits[9]} ({subreddits[9][1]:,} subscribers)")
-    print(f"  #100: {top_subreddits[99]} ({subreddits[99][1]:,} subscribers)")
-    print(f"  #1000: {top_subreddits[999]} ({subreddits[999][1]:,} subscribers)")
+    print(f"  #1: {top_subreddits[0]} ({subscriber_counts[top[0]]:,} subscribers)")
+    print(f"  #10: {top_subreddits[9]} ({subscriber_counts[top[9]]:,} subscribers)")
+    print(f"  #100: {top_subreddits[99]} ({subscriber_counts[top[99]]:,} subscribers)")
+    print(f"  #1000: {top_subreddits[999]} ({subscriber_counts[top[999]]:,} subscribers)")
     if len(top_subreddits) >= 10000:
-        print(f"  #10000: {top_subreddits[9999]} ({subreddits[9999][1]:,} subscribers)")
+        print(f"  #10000: {top_subreddits[9999]} ({subscriber_counts[top[9999]]:,} subscribers)")
     if len(top_subreddits) >= 100000:
-        print(f"  #100000: {top_subreddits[99999]} ({subreddits[99999][1]:,} subscribers)")
+        print(f"  #100000: {top_subreddits[99999]} ({subscriber_counts[top[99999]]:,} subscribers)")
 
     # Save to JSON
     print(f"Saving to {output_path}...")
-    with open(output_path, 'w') as f:
-        json.dump(top_subreddits, f, indent=2)
+    # Encode in one call and write through a large buffer; the indented layout
+    # is kept so subreddits.json diffs stay readable
+    with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(json_dumps_indented(top_subreddits))
 
     print(f"Done! Saved {len(top_subreddits):,} subreddits to {output_path}")
 
@@ -11,26 +11,89 @@ To refresh the list:
     2. Run: python scripts/fetch_subreddit_list.py <downloaded_file.zst>
 """
 
-import json
+import hashlib
+import math
+import os
+import random
+import signal
+import sys
+import threading
 import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
 
+import msgspec
 import pyarrow as pa
-from ratelimit import limits, sleep_and_retry
-from tenacity import retry, stop_after_attempt, wait_exponential
 
-from subsets_utils import get, save_raw_parquet, load_state, save_state
+from subsets_utils import get, save_raw_parquet, load_state, save_state, load_state_log, append_state_log
 
 
-# Rate limits for subredditstats.com - conservative to avoid blocks
-STATS_CALLS_PER_MINUTE = 15
+def log_line(line: str):
+    """Print a line in one write, so output from the save thread can't split it."""
+    sys.stdout.write(f"{line}\n")
+
+
+def _positive_int_env(name: str, default: str) -> int:
+    """Read an integer tunable from the environment, rejecting values below 1."""
+    raw = os.environ.get(name, default)
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1, got {value}")
+    return value
+
+
+def _positive_float_env(name: str, default: str) -> float:
+    """Read a float tunable from the environment, rejecting non-positive or non-finite values."""
+    raw = os.environ.get(name, default)
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {raw!r}") from None
+    if not (math.isfinite(value) and value > 0):
+        raise ValueError(f"{name} must be a positive finite number, got {raw!r}")
+    return value
+
+
+# Raw asset prefix for batched subscriber rows. Older per-subreddit files under
+# "subscribers/" have string dates and int64 counts, so batches with the
+# dictionary/date32/int32 schema go under their own prefix rather than mixing
+SUBSCRIBERS_ASSET = "subscribers_v2"
 
-# Max consecutive errors before stopping (API might be blocking us)
-MAX_CONSECUTIVE_ERRORS = 50
+# Rate limits for subredditstats.com - conservative to avoid blocks
+STATS_CALLS_PER_MINUTE = _positive_int_env("STATS_CALLS_PER_MINUTE", "15")
+
+# Attempts per subreddit and jittered exponential backoff for transient errors
+MAX_ATTEMPTS = 3
+RETRY_BASE_WAIT_SECONDS = 2
+RETRY_MAX_WAIT_SECONDS = 30
+# Pause for all workers after a 429, multiplied by the attempt number
+RATE_LIMIT_COOLDOWN_SECONDS = 60
+
+# Completed subreddits between saves of state and batched parquet output
+STATE_SAVE_EVERY = 200
+# Max seconds between saves, so a SIGKILLed run loses at most this much work.
+# Kept above the ~13 min STATE_SAVE_EVERY takes at 15 calls/min, so batches
+# stay large unless fetching slows down.
+STATE_SAVE_INTERVAL_SECONDS = 15 * 60
+# Saves queued on the writer thread before the main loop waits for one to finish
+MAX_PENDING_SAVES = 2
+
+# Concurrent fetches - keeps the rate limit saturated while requests are in flight
+STATS_MAX_WORKERS = _positive_int_env("STATS_MAX_WORKERS", "4")
+
+# Failed attempts within the window, with no success between, before we stop
+# (API might be blocking us)
+CIRCUIT_BREAKER_FAILURES = _positive_int_env("CIRCUIT_BREAKER_FAILURES", "10")
+CIRCUIT_BREAKER_WINDOW_SECONDS = 300
 
 # Leave buffer for transforms + log upload (GitHub hard limit is 6h)
-GH_ACTIONS_MAX_RUN_SECONDS = 5.8 * 60 * 60  # ~5h 48m
+GH_ACTIONS_MAX_RUN_SECONDS = _positive_float_env("GH_ACTIONS_MAX_RUN_SECONDS", "20880")  # 5.8h, ~5h 48m
 
 
 def load_subreddit_list() -> list[str]:
@@ -49,8 +112,23 @@ def load_subreddit_list() -> list[str]:
             "Run the local fetch script to generate it."
         )
 
-    with open(subreddits_file) as f:
-        return json.load(f)
+    return msgspec.json.decode(subreddits_file.read_bytes(), type=list[str])
+
+
+class TimeSeriesPoint(msgspec.Struct):
+    """One day of a subreddit's subscriber history."""
+    utcDay: int | None = None
+    count: int | None = None
+
+
+class SubredditStats(msgspec.Struct):
+    """The parts of the subredditstats.com response we use - other fields are skipped."""
+    subscriberCountTimeSeries: list[TimeSeriesPoint] | None = None
+
+
+# Schema-driven decoding goes straight to typed structs instead of building
+# dicts for every field in the payload. Non-strict mode accepts whole floats as ints.
+_stats_decoder = msgspec.json.Decoder(SubredditStats, strict=False)
 
 
 class PermanentError(Exception):
@@ -58,26 +136,102 @@ class PermanentError(Exception):
     pass
 
 
-def should_retry(exception):
-    """Only retry on transient errors."""
-    if isinstance(exception, PermanentError):
-        return False
-    return True
+class RateLimitError(Exception):
+    """The API answered 429 - every worker backs off, not just the caller."""
+    pass
+
+
+class DeadlineExceeded(Exception):
+    """The run's time budget ran out before the fetch could be attempted."""
+    pass
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker is open, so the fetch was not attempted."""
+    pass
+
+
+class RateLimiter:
+    """Space calls evenly so at most `calls` start per `period` seconds, across threads."""
+
+    def __init__(self, calls: int, period: float):
+        self.interval = period / calls
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may start its next call."""
+        with self._lock:
+            start = max(time.monotonic(), self._next_start)
+            self._next_start = start + self.interval
+        while True:
+            time.sleep(max(0.0, start - time.monotonic()))
+            with self._lock:
+                # A pause that started while we slept also holds back callers
+                # that had already reserved a slot
+                if self._paused_until <= start:
+                    return
+                start = max(self._paused_until, self._next_start)
+                self._next_start = start + self.interval
+
+    def pause(self, seconds: float):
+        """Hold back every caller, including those already waiting, until `seconds` from now."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._next_start = max(self._next_start, self._paused_until)
+
 
+_rate_limiter = RateLimiter(STATS_CALLS_PER_MINUTE, 60)
 
-@sleep_and_retry
-@limits(calls=STATS_CALLS_PER_MINUTE, period=60)
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=2, min=5, max=120),
-    retry=lambda retry_state: should_retry(retry_state.outcome.exception()) if retry_state.outcome else True,
-    reraise=True
-)
-def fetch_subreddit_stats(subreddit: str) -> dict | None:
-    """Fetch historical subscriber data from subredditstats.com."""
+
+class CircuitBreaker:
+    """Open after `failures` failed attempts within `window` seconds with no success between.
+
+    Shared across fetch workers, so a blocking API is noticed after a few
+    requests. Once open it stays open for the run - the blocked-list cooldown
+    decides when to try again.
+    """
+
+    def __init__(self, failures: int, window: float):
+        self.failures = failures
+        self.window = window
+        self._failed_at = deque()
+        self._open = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def record_success(self):
+        with self._lock:
+            self._failed_at.clear()
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._failed_at.append(now)
+            while self._failed_at[0] < now - self.window:
+                self._failed_at.popleft()
+            if len(self._failed_at) >= self.failures:
+                self._open = True
+
+
+def _fetch_once(
+    subreddit: str,
+    deadline: float | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> SubredditStats | None:
+    """Make a single rate-limited request to subredditstats.com."""
     url = f"https://subredditstats.com/api/subreddit"
     params = {"name": subreddit}
 
+    _rate_limiter.wait()
+    # The wait can run long after a 429 pause, so check again before sending
+    if deadline is not None and time.time() >= deadline:
+        raise DeadlineExceeded(f"Time budget exhausted before fetching {subreddit}")
+    if breaker is not None and breaker.is_open():
+        raise CircuitOpenError(f"Circuit open, skipped {subreddit}")
     response = get(url, params=params, timeout=60.0)
 
     # Permanent failures - don't retry
@@ -86,20 +240,80 @@ def fetch_subreddit_stats(subreddit: str) -> dict | None:
     if response.status_code == 403:
         raise PermanentError(f"Forbidden: {subreddit}")
 
-    # Rate limit - retry with backoff
+    # Rate limit - retry after a cooldown
     if response.status_code == 429:
-        raise Exception(f"Rate limited (429) for {subreddit}")
+        raise RateLimitError(f"Rate limited (429) for {subreddit}")
 
     response.raise_for_status()
-    return response.json()
+    return _stats_decoder.decode(response.content)
 
 
-def utc_day_to_date(utc_day: int) -> str:
-    """Convert UTC day number to ISO date string."""
-    # UTC day is days since Unix epoch (1970-01-01)
-    timestamp = utc_day * 86400
-    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    return dt.strftime("%Y-%m-%d")
+def fetch_subreddit_stats(
+    subreddit: str,
+    deadline: float | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> SubredditStats | None:
+    """Fetch historical subscriber data from subredditstats.com.
+
+    Transient errors are retried with jittered exponential backoff, and a 429
+    pauses all workers for a cooldown. Every attempt counts against the rate
+    limit. PermanentError is raised immediately. No attempt is started after
+    `deadline` (a time.time() value), so abandoned fetches end promptly.
+    Attempt outcomes feed `breaker`, and none are made once it is open.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        if deadline is not None and time.time() >= deadline:
+            raise DeadlineExceeded(f"Time budget exhausted before fetching {subreddit}")
+        if breaker is not None and breaker.is_open():
+            raise CircuitOpenError(f"Circuit open, skipped {subreddit}")
+        try:
+            stats = _fetch_once(subreddit, deadline, breaker)
+        except (PermanentError, DeadlineExceeded, CircuitOpenError):
+            raise
+        except RateLimitError:
+            if breaker is not None:
+                breaker.record_failure()
+            # Cool down even on the last attempt - other workers share the quota
+            _rate_limiter.pause(RATE_LIMIT_COOLDOWN_SECONDS * (attempt + 1))
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            # Full jitter keeps concurrent workers from retrying in lockstep
+            time.sleep(random.uniform(0, min(RETRY_MAX_WAIT_SECONDS, RETRY_BASE_WAIT_SECONDS * 2 ** attempt)))
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return stats
+
+
+def utc_days_to_dates(utc_days: list[int]) -> pa.Array:
+    """Convert UTC day numbers to a date32 array."""
+    # UTC day is days since Unix epoch (1970-01-01), which is exactly date32
+    return pa.array(utc_days, type=pa.int32()).cast(pa.date32())
+
+
+def subreddit_column(subreddit: str, length: int) -> pa.DictionaryArray:
+    """Repeat a subreddit name as a dictionary column with a single entry."""
+    indices = pa.repeat(pa.scalar(0, type=pa.int32()), length)
+    return pa.DictionaryArray.from_arrays(indices, pa.array([subreddit], type=pa.string()))
+
+
+def save_batch(tables: list[pa.Table], fetched: list[str], not_found: list[str], state: dict):
+    """Write one batch of subscriber rows, then record its subreddits in state."""
+    # Write rows before state, so a subreddit is only recorded as fetched
+    # once its data is saved. One file per batch instead of per subreddit,
+    # with a single shared subreddit dictionary across the batch.
+    if tables:
+        batch_id = f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        batch = pa.concat_tables(tables).combine_chunks()
+        save_raw_parquet(batch, f"{SUBSCRIBERS_ASSET}/{batch_id}", compression="zstd")
+    append_state_log("subreddit_subscribers", fetched)
+    append_state_log("subreddit_subscribers_not_found", not_found)
+    save_state("subreddit_subscribers", state)
 
 
 def run() -> bool:
@@ -109,13 +323,68 @@ def run() -> bool:
         bool: True if more work remains (should retrigger), False if complete
     """
     start_time = time.time()
+    deadline = start_time + GH_ACTIONS_MAX_RUN_SECONDS
     state = load_state("subreddit_subscribers")
-    fetched_subreddits = set(state.get("fetched", []))
+    # Fetched subreddits only ever grow, so they live in an append-only log
+    # rather than being rewritten with the rest of the state on every save
+    if "fetched" in state:
+        # Migrate state written before the log existed
+        append_state_log("subreddit_subscribers", state.pop("fetched"))
+        save_state("subreddit_subscribers", state)
+    fetched_subreddits = set(load_state_log("subreddit_subscribers"))
+    # Subreddits the API returned 404 for - kept apart from fetched so dead
+    # names are never requested again, even if a refreshed list re-adds them
+    not_found_subreddits = set(load_state_log("subreddit_subscribers_not_found"))
+    newly_fetched = []  # fetched since the last save
+    newly_not_found = []
     failed_subreddits = set(state.get("failed", []))
     # Track subreddits that failed due to API blocking - retry after cooldown
     blocked_subreddits = set(state.get("blocked", []))
     blocked_at = state.get("blocked_at")  # ISO timestamp when blocking started
 
+    # Batch saves instead of writing after every subreddit
+    unsaved = 0
+    unsaved_tables = []  # subscriber rows not yet written to parquet
+    last_saved = time.monotonic()
+
+    # Saves run in order on one writer thread, so parquet encoding and uploads
+    # overlap with fetching while the rows-before-state ordering still holds
+    writer = ThreadPoolExecutor(max_workers=1)
+    pending_saves = deque()
+
+    def save_progress(blocked_at):
+        nonlocal unsaved, last_saved
+        # Bound queued batches so memory stays flat if writes fall behind
+        while len(pending_saves) >= MAX_PENDING_SAVES:
+            pending_saves.popleft().result()
+        pending_saves.append(writer.submit(
+            save_batch,
+            list(unsaved_tables),
+            list(newly_fetched),
+            list(newly_not_found),
+            {
+                "failed": list(failed_subreddits),
+                "blocked": list(blocked_subreddits),
+                "blocked_at": blocked_at
+            },
+        ))
+        unsaved_tables.clear()
+        newly_fetched.clear()
+        newly_not_found.clear()
+        unsaved = 0
+        last_saved = time.monotonic()
+
+    def wait_for_saves():
+        # Surfaces any write error here, on the main thread
+        while pending_saves:
+            pending_saves.popleft().result()
+
+    def record_progress():
+        nonlocal unsaved
+        unsaved += 1
+        if unsaved >= STATE_SAVE_EVERY or time.monotonic() - last_saved >= STATE_SAVE_INTERVAL_SECONDS:
+            save_progress(blocked_at)
+
     # Clear blocked list if enough time has passed (24 hours cooldown)
     if blocked_at and blocked_subreddits:
         blocked_time = datetime.fromisoformat(blocked_at)
@@ -124,146 +393,164 @@ def run() -> bool:
             print(f"  Clearing {len(blocked_subreddits)} blocked subreddits after {hours_since_block:.1f}h cooldown")
             blocked_subreddits.clear()
             blocked_at = None
-            save_state("subreddit_subscribers", {
-                "fetched": list(fetched_subreddits),
-                "failed": list(failed_subreddits),
-                "blocked": [],
-                "blocked_at": None
-            })
+            save_progress(blocked_at)
+            wait_for_saves()
 
     # Load from pre-fetched file
     subreddits = load_subreddit_list()
     print(f"  Loaded {len(subreddits)} subreddits from subreddits.json")
 
-    # Fetch historical data for each subreddit (skip already fetched, failed, AND blocked)
-    pending = [s for s in subreddits if s not in fetched_subreddits and s not in failed_subreddits and s not in blocked_subreddits]
-    print(f"  Fetching stats for {len(pending)} subreddits ({len(fetched_subreddits)} done, {len(failed_subreddits)} failed, {len(blocked_subreddits)} blocked)...")
+    # Fetch historical data for each subreddit (skip already fetched, not found, failed, AND blocked)
+    # One read-only lookup per subreddit instead of four
+    skip = frozenset(fetched_subreddits | not_found_subreddits | failed_subreddits | blocked_subreddits)
+    pending = [s for s in subreddits if s not in skip]
+    # subreddits.json is ordered by size, so large and small subreddits (slow
+    # and fast responses) would otherwise arrive in long runs. A stable hash
+    # order interleaves them and stays the same across continuation runs.
+    pending.sort(key=lambda s: hashlib.blake2b(s.encode(), digest_size=4).digest())
+    print(f"  Fetching stats for {len(pending)} subreddits ({len(fetched_subreddits)} done, {len(not_found_subreddits)} not found, {len(failed_subreddits)} failed, {len(blocked_subreddits)} blocked)...")
 
     if not pending and blocked_subreddits:
         print(f"  All pending items are blocked. Waiting for cooldown.")
+        writer.shutdown()
         return False  # Don't retrigger - wait for scheduled run after cooldown
 
-    consecutive_errors = 0
+    breaker = CircuitBreaker(CIRCUIT_BREAKER_FAILURES, CIRCUIT_BREAKER_WINDOW_SECONDS)
     processed_this_run = 0
     current_block_batch = []  # Track subreddits that fail during current blocking period
 
-    for i, subreddit in enumerate(pending):
-        # Stop if too many consecutive errors (API might be blocking us)
-        # Check this BEFORE time budget - if we're blocked, don't burn time on retries
-        if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
-            print(f"  Hit {consecutive_errors} consecutive errors - API is blocking.")
-            # Add all subreddits that failed during this block to blocked list
-            blocked_subreddits.update(current_block_batch)
-            save_state("subreddit_subscribers", {
-                "fetched": list(fetched_subreddits),
-                "failed": list(failed_subreddits),
-                "blocked": list(blocked_subreddits),
-                "blocked_at": datetime.now(timezone.utc).isoformat()
-            })
-            print(f"  Added {len(current_block_batch)} subreddits to blocked list for 24h cooldown")
-            return False  # Don't retrigger immediately - wait for cooldown
-
-        # Check time budget before processing
-        elapsed = time.time() - start_time
-        if elapsed >= GH_ACTIONS_MAX_RUN_SECONDS:
-            # If we had consecutive errors, save them to blocked list before exiting
-            if current_block_batch:
+    # Fetches run on worker threads so the rate limit, not per-request latency,
+    # sets throughput. Results are handled here on the main thread, so state
+    # and parquet writes stay sequential.
+    executor = ThreadPoolExecutor(max_workers=STATS_MAX_WORKERS)
+    in_flight = {}  # future -> subreddit
+    submitted = 0
+    completed = 0
+
+    # A cancelled workflow is stopped with SIGTERM, which would otherwise kill
+    # the process without running the finally block below
+    def exit_on_sigterm(signum, frame):
+        raise SystemExit(128 + signum)
+
+    previous_sigterm_handler = signal.signal(signal.SIGTERM, exit_on_sigterm)
+
+    try:
+        while submitted < len(pending) or in_flight:
+            # Stop once the circuit breaker opens (API might be blocking us)
+            # Check this BEFORE time budget - if we're blocked, don't burn time on retries
+            if breaker.is_open():
+                print(f"  Hit {CIRCUIT_BREAKER_FAILURES} failed requests without a success - API is blocking.")
+                # Add all subreddits that failed during this block to blocked list
                 blocked_subreddits.update(current_block_batch)
-                save_state("subreddit_subscribers", {
-                    "fetched": list(fetched_subreddits),
-                    "failed": list(failed_subreddits),
-                    "blocked": list(blocked_subreddits),
-                    "blocked_at": datetime.now(timezone.utc).isoformat()
-                })
-                print(f"  Time budget exhausted after {elapsed/3600:.1f}h, {len(pending) - i} remaining")
-                print(f"  Added {len(current_block_batch)} subreddits to blocked list (were failing)")
-                return False  # Don't retrigger - we're being blocked
-            print(f"  Time budget exhausted after {elapsed/3600:.1f} hours, {len(pending) - i} subreddits remaining")
-            return True  # More work to do
-
-        print(f"    [{i+1}/{len(pending)}] {subreddit}...", end=" ", flush=True)
-
-        try:
-            stats = fetch_subreddit_stats(subreddit)
-            consecutive_errors = 0  # Reset on success
-            current_block_batch.clear()  # Clear block batch on success
-
-            if not stats:
-                print("not found")
-                fetched_subreddits.add(subreddit)
-                save_state("subreddit_subscribers", {
-                    "fetched": list(fetched_subreddits),
-                    "failed": list(failed_subreddits),
-                    "blocked": list(blocked_subreddits),
-                    "blocked_at": blocked_at
-                })
-                continue
-
-            time_series = stats.get("subscriberCountTimeSeries", [])
-
-            if not time_series:
-                print("no time series")
-                fetched_subreddits.add(subreddit)
-                save_state("subreddit_subscribers", {
-                    "fetched": list(fetched_subreddits),
-                    "failed": list(failed_subreddits),
-                    "blocked": list(blocked_subreddits),
-                    "blocked_at": blocked_at
-                })
-                continue
-
-            # Convert to table format
-            rows = []
-            for point in time_series:
-                utc_day = point.get("utcDay")
-                count = point.get("count")
-                if utc_day is not None and count is not None:
-                    rows.append({
-                        "subreddit": subreddit,
-                        "date": utc_day_to_date(utc_day),
-                        "subscribers": count
+                save_progress(datetime.now(timezone.utc).isoformat())
+                print(f"  Added {len(current_block_batch)} subreddits to blocked list for 24h cooldown")
+                return False  # Don't retrigger immediately - wait for cooldown
+
+            # Check time budget before submitting more work. Fetches still in
+            # flight at the deadline are abandoned and stay pending for the next run.
+            elapsed = time.time() - start_time
+            out_of_time = elapsed >= GH_ACTIONS_MAX_RUN_SECONDS
+            while not out_of_time and submitted < len(pending) and len(in_flight) < STATS_MAX_WORKERS:
+                subreddit = pending[submitted]
+                in_flight[executor.submit(fetch_subreddit_stats, subreddit, deadline, breaker)] = subreddit
+                submitted += 1
+
+            if out_of_time:
+                # If the latest fetches were all failing, save them to blocked list before exiting
+                if current_block_batch:
+                    blocked_subreddits.update(current_block_batch)
+                    save_progress(datetime.now(timezone.utc).isoformat())
+                    print(f"  Time budget exhausted after {elapsed/3600:.1f}h, {len(pending) - completed} remaining")
+                    print(f"  Added {len(current_block_batch)} subreddits to blocked list (were failing)")
+                    return False  # Don't retrigger - we're being blocked
+                print(f"  Time budget exhausted after {elapsed/3600:.1f} hours, {len(pending) - completed} subreddits remaining")
+                return True  # More work to do
+
+            # Wake at the deadline even if no fetch completes by then
+            done, _ = wait(in_flight, timeout=deadline - time.time(), return_when=FIRST_COMPLETED)
+            for future in done:
+                subreddit = in_flight.pop(future)
+                completed += 1
+                # Logged as one line with the result, so output from the save
+                # thread can't land in the middle of it
+                progress = f"    [{completed}/{len(pending)}] {subreddit}..."
+
+                # Only the fetch is guarded here - a failed save raised from
+                # record_progress() must abort the run, not count as a fetch error
+                try:
+                    stats = future.result()
+                except PermanentError as e:
+                    # Permanent failure - mark as failed and move on
+                    log_line(f"{progress} permanent error: {e}")
+                    failed_subreddits.add(subreddit)
+                    current_block_batch.clear()
+                    record_progress()
+                    continue
+
+                except (DeadlineExceeded, CircuitOpenError) as e:
+                    # Never attempted - stays pending for the next run
+                    log_line(f"{progress} skipped: {e}")
+                    continue
+
+                except Exception as e:
+                    # Transient error - track for potential blocking
+                    log_line(f"{progress} error: {e}")
+                    current_block_batch.append(subreddit)
+                    continue
+
+                current_block_batch.clear()  # Clear block batch on success
+
+                if not stats:
+                    log_line(f"{progress} not found")
+                    not_found_subreddits.add(subreddit)
+                    newly_not_found.append(subreddit)
+                    record_progress()
+                    continue
+
+                time_series = stats.subscriberCountTimeSeries
+
+                if not time_series:
+                    log_line(f"{progress} no time series")
+                    fetched_subreddits.add(subreddit)
+                    newly_fetched.append(subreddit)
+                    record_progress()
+                    continue
+
+                # Build columns directly - no per-point row dicts
+                utc_days = []
+                counts = []
+                for point in time_series:
+                    utc_day = point.utcDay
+                    count = point.count
+                    if utc_day is not None and count is not None:
+                        utc_days.append(utc_day)
+                        counts.append(count)
+
+                if utc_days:
+                    table = pa.table({
+                        "subreddit": subreddit_column(subreddit, len(utc_days)),
+                        "date": utc_days_to_dates(utc_days),
+                        "subscribers": pa.array(counts, type=pa.int32()),
                     })
 
-            if rows:
-                # Create PyArrow table
-                table = pa.table({
-                    "subreddit": pa.array([r["subreddit"] for r in rows], type=pa.string()),
-                    "date": pa.array([r["date"] for r in rows], type=pa.string()),
-                    "subscribers": pa.array([r["subscribers"] for r in rows], type=pa.int64()),
-                })
-
-                save_raw_parquet(table, f"subscribers/{subreddit}")
-                print(f"{len(rows)} days")
-            else:
-                print("empty")
-
-            fetched_subreddits.add(subreddit)
-            processed_this_run += 1
-            save_state("subreddit_subscribers", {
-                "fetched": list(fetched_subreddits),
-                "failed": list(failed_subreddits),
-                "blocked": list(blocked_subreddits),
-                "blocked_at": blocked_at
-            })
-
-        except PermanentError as e:
-            # Permanent failure - mark as failed and move on
-            print(f"permanent error: {e}")
-            failed_subreddits.add(subreddit)
-            consecutive_errors = 0  # Don't count permanent errors
-            current_block_batch.clear()
-            save_state("subreddit_subscribers", {
-                "fetched": list(fetched_subreddits),
-                "failed": list(failed_subreddits),
-                "blocked": list(blocked_subreddits),
-                "blocked_at": blocked_at
-            })
-
-        except Exception as e:
-            # Transient error - track for potential blocking
-            print(f"error: {e}")
-            consecutive_errors += 1
-            current_block_batch.append(subreddit)
+                    unsaved_tables.append(table)
+                    log_line(f"{progress} {len(utc_days)} days")
+                else:
+                    log_line(f"{progress} empty")
 
-    print(f"  Done! Fetched {processed_this_run} this run, {len(fetched_subreddits)} total, {len(failed_subreddits)} failed")
+                fetched_subreddits.add(subreddit)
+                newly_fetched.append(subreddit)
+                processed_this_run += 1
+                record_progress()
+    finally:
+        signal.signal(signal.SIGTERM, previous_sigterm_handler)
+        # Abandon queued fetches; anything still running is discarded unprocessed
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Don't lose batched progress if we exit early or hit an unexpected error
+        if unsaved:
+            save_progress(blocked_at)
+        wait_for_saves()
+        writer.shutdown()
+
+    print(f"  Done! Fetched {processed_this_run} this run, {len(fetched_subreddits)} total, {len(not_found_subreddits)} not found, {len(failed_subreddits)} failed")
     return False  # All done
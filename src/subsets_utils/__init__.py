@@ -1,5 +1,5 @@
 from .http_client import get, post, put, delete
-from .io import upload_data, load_state, save_state, load_asset, has_changed, save_raw_json, load_raw_json, save_raw_file, load_raw_file, save_raw_parquet, load_raw_parquet
+from .io import upload_data, load_state, save_state, load_state_log, append_state_log, load_asset, has_changed, save_raw_json, load_raw_json, save_raw_file, load_raw_file, save_raw_parquet, load_raw_parquet
 from .environment import validate_environment, get_data_dir
 from .publish import publish
 from .testing import validate
@@ -7,7 +7,8 @@ from . import debug
 
 __all__ = [
     'get', 'post', 'put', 'delete',
-    'upload_data', 'load_state', 'save_state', 'load_asset', 'has_changed',
+    'upload_data', 'load_state', 'save_state', 'load_state_log', 'append_state_log',
+    'load_asset', 'has_changed',
     'save_raw_json', 'load_raw_json', 'save_raw_file', 'load_raw_file',
     'save_raw_parquet', 'load_raw_parquet',
     'validate_environment', 'get_data_dir',
@@ -1,3 +1,4 @@
+import atexit
 import os
 import httpx
 import time
@@ -6,7 +7,9 @@ from . import debug
 _client = None
 _client_config = {
     'timeout': int(os.environ.get('HTTP_TIMEOUT', '30')),
-    'headers': {'User-Agent': os.environ.get('HTTP_USER_AGENT', 'DataIntegrations/1.0')}
+    'headers': {'User-Agent': os.environ.get('HTTP_USER_AGENT', 'DataIntegrations/1.0')},
+    'max_keepalive_connections': int(os.environ.get('HTTP_MAX_KEEPALIVE', '8')),
+    'keepalive_expiry': float(os.environ.get('HTTP_KEEPALIVE_EXPIRY', '120')),
 }
 
 
@@ -17,7 +20,11 @@ def _get_or_create_client() -> httpx.Client:
         _client = httpx.Client(
             timeout=_client_config['timeout'],
             headers=_client_config['headers'],
-            follow_redirects=True
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=_client_config['max_keepalive_connections'],
+                keepalive_expiry=_client_config['keepalive_expiry'],
+            ),
         )
 
     return _client
@@ -62,9 +69,16 @@ def get_client() -> httpx.Client:
     return _get_or_create_client()
 
 
-def configure_http(**config):
-    global _client_config, _client
-    _client_config.update(config)
+def close_client():
+    global _client
     if _client:
         _client.close()
         _client = None
+
+
+def configure_http(**config):
+    _client_config.update(config)
+    close_client()
+
+
+atexit.register(close_client)
@@ -2,6 +2,7 @@
 
 import os
 import io
+import sys
 import json
 import gzip
 import uuid
@@ -12,7 +13,7 @@ import pyarrow.parquet as pq
 from deltalake import write_deltalake, DeltaTable
 from . import debug
 from .environment import get_data_dir
-from .r2 import is_cloud_mode, upload_bytes, upload_file, download_bytes, get_storage_options, get_delta_table_uri, get_bucket_name, get_connector_name
+from .r2 import is_cloud_mode, upload_bytes, upload_file, download_bytes, list_keys, delete_keys, get_storage_options, get_delta_table_uri, get_bucket_name, get_connector_name
 
 
 # --- Delta table operations ---
@@ -124,13 +125,76 @@ def save_state(asset: str, state_data: dict) -> str:
         state_dir = Path(get_data_dir()) / "state"
         state_dir.mkdir(parents=True, exist_ok=True)
         state_file = state_dir / f"{asset}.json"
-        json.dump(state_data, open(state_file, 'w'), indent=2)
+        # Write a sibling temp file and rename over the old state, so a run
+        # killed mid-write never leaves a truncated state file behind
+        tmp_file = state_file.with_suffix(".json.tmp")
+        tmp_file.write_text(json.dumps(state_data, indent=2), encoding='utf-8')
+        os.replace(tmp_file, state_file)
         debug.log_state_change(asset, old_state, state_data)
         return str(state_file)
 
 
+# --- State log operations ---
+
+# Segments a cloud state log may grow to before load_state_log merges them
+STATE_LOG_COMPACT_SEGMENTS = 50
+
+
+def _state_log_key_prefix(asset: str) -> str:
+    return f"{get_connector_name()}/data/state/{asset}.log/"
+
+
+def load_state_log(asset: str) -> list[str]:
+    """Load all entries appended to an asset's state log.
+
+    In cloud mode, a log with many segments is compacted into its newest
+    segment, dropping repeated entries. If that is interrupted, some entries
+    may appear twice until the next compaction.
+    """
+    if is_cloud_mode():
+        keys = sorted(list_keys(_state_log_key_prefix(asset)))
+        entries = []
+        for key in keys:
+            data = download_bytes(key)
+            if data:
+                entries.extend(data.decode('utf-8').splitlines())
+        if len(keys) > STATE_LOG_COMPACT_SEGMENTS:
+            # Rewrite the newest segment with everything, then drop the rest
+            entries = list(dict.fromkeys(entries))
+            upload_bytes("".join(f"{entry}\n" for entry in entries).encode('utf-8'), keys[-1])
+            delete_keys(keys[:-1])
+        return entries
+    else:
+        log_file = Path(get_data_dir()) / "state" / f"{asset}.log"
+        return log_file.read_text(encoding='utf-8').splitlines() if log_file.exists() else []
+
+
+def append_state_log(asset: str, entries: list[str]) -> str:
+    """Append entries to an asset's state log without rewriting earlier entries."""
+    if not entries:
+        return ""
+    content = "".join(f"{entry}\n" for entry in entries)
+
+    if is_cloud_mode():
+        # R2 objects can't be appended to, so each call writes a new segment
+        key = f"{_state_log_key_prefix(asset)}{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.txt"
+        return upload_bytes(content.encode('utf-8'), key)
+    else:
+        state_dir = Path(get_data_dir()) / "state"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        log_file = state_dir / f"{asset}.log"
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(content)
+        return str(log_file)
+
+
 # --- Raw data operations ---
 
+def _print_line(message: str):
+    """Print a line in one write, so it can't interleave with output from other threads."""
+    sys.stdout.write(f"{message}\n")
+
+
 def _raw_path(asset_id: str, ext: str) -> Path:
     path = Path(get_data_dir()) / "raw" / f"{asset_id}.{ext}"
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -145,7 +209,7 @@ def save_raw_file(content: str | bytes, asset_id: str, extension: str = "txt") -
     """Save raw file (CSV, XML, ZIP, etc.)."""
     if is_cloud_mode():
         data = content.encode('utf-8') if isinstance(content, str) else content
-        print(f"  -> R2: Saved {asset_id}.{extension}")
+        _print_line(f"  -> R2: Saved {asset_id}.{extension}")
         return upload_bytes(data, _raw_key(asset_id, extension))
     else:
         path = _raw_path(asset_id, extension)
@@ -153,7 +217,7 @@ def save_raw_file(content: str | bytes, asset_id: str, extension: str = "txt") -
             path.write_text(content, encoding='utf-8')
         else:
             path.write_bytes(content)
-        print(f"  -> Raw Cache: Saved {asset_id}.{extension}")
+        _print_line(f"  -> Raw Cache: Saved {asset_id}.{extension}")
         return str(path)
 
 
@@ -189,12 +253,12 @@ def save_raw_json(data: any, asset_id: str, compress: bool = False) -> str:
         content = json.dumps(data, indent=2).encode('utf-8')
 
     if is_cloud_mode():
-        print(f"  -> R2: Saved {asset_id}.{ext}")
+        _print_line(f"  -> R2: Saved {asset_id}.{ext}")
         return upload_bytes(content, _raw_key(asset_id, ext))
     else:
         path = _raw_path(asset_id, ext)
         path.write_bytes(content)
-        print(f"  -> Raw Cache: Saved {asset_id}.{ext}")
+        _print_line(f"  -> Raw Cache: Saved {asset_id}.{ext}")
         return str(path)
 
 
@@ -220,7 +284,7 @@ def load_raw_json(asset_id: str) -> any:
         raise FileNotFoundError(f"Raw asset '{asset_id}' not found.")
 
 
-def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> str:
+def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None, compression: str = "snappy") -> str:
     """Save raw PyArrow table as Parquet."""
     if metadata:
         existing = data.schema.metadata or {}
@@ -230,17 +294,17 @@ def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> st
     if is_cloud_mode():
         temp_path = f"/tmp/{uuid.uuid4()}.parquet"
         try:
-            pq.write_table(data, temp_path, compression='snappy')
+            pq.write_table(data, temp_path, compression=compression)
             uri = upload_file(temp_path, _raw_key(asset_id, "parquet"))
-            print(f"  -> R2: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
+            _print_line(f"  -> R2: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
             return uri
         finally:
             if os.path.exists(temp_path):
                 os.remove(temp_path)
     else:
         path = _raw_path(asset_id, "parquet")
-        pq.write_table(data, path, compression='snappy')
-        print(f"  -> Raw Cache: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
+        pq.write_table(data, path, compression=compression)
+        _print_line(f"  -> Raw Cache: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
         return str(path)
 
 
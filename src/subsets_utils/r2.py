@@ -71,6 +71,17 @@ def download_bytes(key: str) -> Optional[bytes]:
         return None
 
 
+def delete_keys(keys: list[str]) -> None:
+    """Delete keys from R2, in batches of the S3 per-request limit."""
+    client = get_s3_client()
+    bucket = get_bucket_name()
+    for i in range(0, len(keys), 1000):
+        client.delete_objects(
+            Bucket=bucket,
+            Delete={'Objects': [{'Key': key} for key in keys[i:i + 1000]], 'Quiet': True}
+        )
+
+
 def get_storage_options() -> dict:
     """Get storage options for deltalake S3 writes."""
     config = _get_r2_config()